@@ -4,6 +4,7 @@ import contextlib
 import ctypes
 import dataclasses
 import enum
+import functools
 import logging
 import os
 import sys
@@ -27,8 +28,8 @@ from rpcclient.fs import Fs
 from rpcclient.lief import Lief
 from rpcclient.network import Network
 from rpcclient.processes import Processes
-from rpcclient.protobuf_bridge import Argument, CmdCall, CmdDlclose, CmdDlopen, CmdDlsym, CmdDummyBlock, CmdExec, \
-    CmdListDir, CmdPeek, CmdPoke, Response
+from rpcclient.protobuf_bridge import Argument, CmdBatchCall, CmdCall, CmdDlclose, CmdDlopen, CmdDlsym, CmdDummyBlock, \
+    CmdExec, CmdListDir, CmdPeek, CmdPoke, Response
 from rpcclient.protosocket import ProtoSocket
 from rpcclient.structs.consts import EAGAIN, ECONNREFUSED, EEXIST, EISDIR, ENOENT, ENOTDIR, ENOTEMPTY, EPERM, EPIPE, \
     RTLD_NEXT
@@ -91,6 +92,61 @@ class ProtocolDirent:
     stat: ProtocolDitentStat
 
 
+class BatchCallResult:
+    """ return value of a queued batch call. available once the batch has been dispatched """
+
+    def __init__(self, batch: 'Batch', index: int):
+        self.batch = batch
+        self.index = index
+        self.value: Optional[Symbol] = None
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} INDEX:{self.index} VALUE:{self.value}>'
+
+
+# converters from python objects into call arguments. the order is kept as the precedence for objects whose type is
+# only matched by inheritance
+ARGUMENT_BUILDERS = (
+    (float, lambda arg: Argument(v_double=arg)),
+    (str, lambda arg: Argument(v_str=arg)),
+    (int, lambda arg: Argument(v_int=ctypes.c_uint64(arg).value)),
+    (bytes, lambda arg: Argument(v_bytes=arg)),
+    (enum.Enum, lambda arg: Argument(v_int=ctypes.c_uint64(arg.value).value)),
+)
+
+
+@functools.lru_cache(maxsize=128)
+def _get_argument_builder(type_: type) -> Optional[typing.Callable]:
+    """ resolve the builder of given argument type once, since subclasses (such as Symbol or bool) are common """
+    return next((builder for base, builder in ARGUMENT_BUILDERS if issubclass(type_, base)), None)
+
+
+class Batch:
+    """ calls queued to be dispatched together by `Client.batch()` """
+
+    def __init__(self):
+        self.calls = []
+        self.results: list[BatchCallResult] = []
+
+    def call(self, address: int, *argv, va_list_index: int = 0xffff) -> BatchCallResult:
+        """
+        queue a remote call. the returned object may be passed as an argument to subsequent calls of this batch, or
+        to calls of any batch once this one has been dispatched
+        """
+        resolved_argv = []
+        for arg in argv:
+            if isinstance(arg, BatchCallResult) and arg.batch is not self:
+                if arg.value is None:
+                    raise ArgumentError(f'{arg} belongs to a batch which has not been dispatched')
+                arg = arg.value
+            resolved_argv.append(arg)
+
+        result = BatchCallResult(self, len(self.calls))
+        self.calls.append((address, resolved_argv, va_list_index))
+        self.results.append(result)
+        return result
+
+
 class Client:
     """ Main client interface to access remote rpcserver """
 
@@ -167,23 +223,11 @@ class Client:
     def call(self, address: int, argv: list[int] = None, return_float64=False, return_float32=False,
              return_raw=False, va_list_index: int = 0xffff) -> typing.Union[float, Symbol, Any]:
         """ call a remote function and retrieve its return value as Symbol object """
-        args = []
-        for arg in argv:
-            if isinstance(arg, float):
-                args.append(Argument(v_double=arg))
-            elif isinstance(arg, str):
-                args.append(Argument(v_str=arg))
-            elif isinstance(arg, int):
-                args.append(Argument(v_int=ctypes.c_uint64(arg).value))
-            elif isinstance(arg, bytes):
-                args.append(Argument(v_bytes=arg))
-            elif isinstance(arg, enum.Enum):
-                args.append(Argument(v_int=ctypes.c_uint64(arg.value).value))
-            else:
-                raise ArgumentError()
-
-        command = CmdCall(address=address, va_list_index=va_list_index, argv=args)
-        response = self._sock.send_recv(command)
+        command = CmdCall(address=address, va_list_index=va_list_index, argv=self._build_argv(argv))
+        try:
+            response = self._sock.send_recv(command)
+        except ServerResponseError:
+            raise ArgumentError(f'unsupported arguments: {argv}')
         if response.HasField('arm_registers'):
             double = response.arm_registers.d0
             if return_float32:
@@ -195,6 +239,38 @@ class Client:
             return self.symbol(response.arm_registers.x0)
         return self.symbol(response.return_value)
 
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        queue remote calls and dispatch them all at once using a single round trip.
+        the return value of each queued call may be passed as an argument to the calls following it.
+
+        example:
+            with client.batch() as batch:
+                buf = batch.call(client.symbols.malloc, 0x10)
+                batch.call(client.symbols.strcpy, buf, 'hello')
+                length = batch.call(client.symbols.strlen, buf)
+                batch.call(client.symbols.free, buf)
+            assert length.value == 5
+        """
+        batch = Batch()
+        yield batch
+        if not batch.calls:
+            return
+
+        calls = [CmdCall(address=address, va_list_index=va_list_index, argv=self._build_batch_argv(argv))
+                 for address, argv, va_list_index in batch.calls]
+        try:
+            response = self._sock.send_recv(CmdBatchCall(calls=calls))
+        except ServerResponseError:
+            raise ArgumentError('batch contains a call with an invalid argument')
+
+        for result, response_call in zip(batch.results, response.results):
+            if response_call.HasField('arm_registers'):
+                result.value = self.symbol(response_call.arm_registers.x0)
+            else:
+                result.value = self.symbol(response_call.return_value)
+
     def peek(self, address: int, size: int) -> bytes:
         """ peek data at given address """
         command = CmdPeek(address=address, size=size)
@@ -343,12 +419,8 @@ class Client:
 
     @contextlib.contextmanager
     def safe_calloc(self, size: int):
-        with self.safe_malloc(size) as x:
-            x.poke(b'\x00' * size)
-            try:
-                yield x
-            finally:
-                pass
+        with self.freeing(self.symbols.calloc(1, size)) as x:
+            yield x
 
     @contextlib.contextmanager
     def safe_malloc(self, size: int):
@@ -451,6 +523,22 @@ class Client:
             # new clients are handled in new processes so all symbols may reside in different addresses
             self._init_process_specific()
 
+    @staticmethod
+    def _build_argv(argv: list) -> list[Argument]:
+        args = []
+        for arg in argv:
+            builder = _get_argument_builder(type(arg))
+            if builder is None:
+                raise ArgumentError()
+            args.append(builder(arg))
+        return args
+
+    @staticmethod
+    def _build_batch_argv(argv: list) -> list[Argument]:
+        """ build the arguments of a batched call, where results of preceding calls are referred to by their index """
+        return [Argument(v_input_from=arg.index) if isinstance(arg, BatchCallResult) else Client._build_argv([arg])[0]
+                for arg in argv]
+
     def _execute(self, argv: list[str], envp: list[str], background=False) -> int:
         command = CmdExec(background=background, argv=argv, envp=envp)
         try:
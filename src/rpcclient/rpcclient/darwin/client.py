@@ -3,8 +3,10 @@ import builtins
 import json
 import logging
 import plistlib
+import struct
+import threading
 import typing
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 from dataclasses import dataclass
 from functools import lru_cache
 
@@ -15,7 +17,8 @@ from rpcclient.client import Client
 from rpcclient.darwin import objective_c_class
 from rpcclient.darwin.bluetooth import Bluetooth
 from rpcclient.darwin.common import CfSerializable
-from rpcclient.darwin.consts import CFPropertyListFormat, CFPropertyListMutabilityOptions, kCFAllocatorDefault
+from rpcclient.darwin.consts import CFPropertyListFormat, CFPropertyListMutabilityOptions, CFStringEncoding, \
+    kCFAllocatorDefault, kCFNumberSInt64Type
 from rpcclient.darwin.core_graphics import CoreGraphics
 from rpcclient.darwin.darwin_lief import DarwinLief
 from rpcclient.darwin.fs import DarwinFs
@@ -50,6 +53,13 @@ ISA_MAGICS = [
 # Mask for tagged pointer, from objc-internal.h
 OBJC_TAG_MASK = (1 << 63)
 
+# maximal number of CFStrings kept alive for reuse by `DarwinClient.cf()`
+CF_CACHE_SIZE = 256
+
+# range of integers whose CFNumbers are commonly used (flags, counters, indices) and are therefore cached by `cf()`.
+# they are kept apart from the LRU cache, so heavy string usage never evicts them
+CF_CACHED_INT_RANGE = range(-128, 1025)
+
 FRAMEWORKS_PATH = '/System/Library/Frameworks'
 PRIVATE_FRAMEWORKS_PATH = '/System/Library/PrivateFrameworks'
 LIB_PATH = '/usr/lib'
@@ -75,6 +85,16 @@ class DarwinClient(Client):
 
     def _init_process_specific(self):
         super()._init_process_specific()
+        self._invalidate_images_cache()
+
+        # cached CFObjects reside in the remote process, so they must never outlive it
+        self._cf_cache: OrderedDict[tuple, DarwinSymbol] = OrderedDict()
+        self._cf_int_cache: dict[int, DarwinSymbol] = {}
+        self._cf_cache_lock = threading.Lock()
+        self._cf_booleans: dict[bool, DarwinSymbol] = {}
+        self._cf_constants: dict[str, DarwinSymbol] = {}
+        self._selectors: dict[str, DarwinSymbol] = {}
+        self._classes: dict[str, DarwinSymbol] = {}
 
         if 0 == self.dlopen('/System/Library/Frameworks/CoreFoundation.framework/CoreFoundation', RTLD_NOW):
             raise MissingLibraryError('failed to load CoreFoundation')
@@ -117,22 +137,44 @@ class DarwinClient(Client):
         p_error.item_size = 4
         p_error[0] = value
 
-    @property
+    @cached_property
     def images(self) -> list[DyldImage]:
-        m = []
-        for i in range(self.symbols._dyld_image_count()):
-            module_name = self.symbols._dyld_get_image_name(i).peek_str()
-            base_address = self.symbols._dyld_get_image_header(i)
-            m.append(
-                DyldImage(module_name, base_address)
-            )
-        return m
+        """ get the loaded dyld images. cached until an image is loaded or unloaded through this client """
+        image_count = self.symbols._dyld_image_count()
+        if image_count == 0:
+            return []
+
+        with self.batch() as batch:
+            names = []
+            headers = []
+            lengths = []
+            for i in range(image_count):
+                name = batch.call(self.symbols._dyld_get_image_name, i)
+                names.append(name)
+                headers.append(batch.call(self.symbols._dyld_get_image_header, i))
+                lengths.append(batch.call(self.symbols.strlen, name))
+
+        # gather all names into a single buffer, so they can be read using a single peek
+        offsets = []
+        total_size = 0
+        for length in lengths:
+            offsets.append(total_size)
+            total_size += int(length.value) + 1
+
+        with self.safe_malloc(total_size) as buf:
+            with self.batch() as batch:
+                for name, length, offset in zip(names, lengths, offsets):
+                    batch.call(self.symbols.memcpy, buf + offset, name.value, length.value)
+            names_buf = buf.peek(total_size)
+
+        return [DyldImage(names_buf[offset:offset + length.value].decode(), header.value)
+                for offset, length, header in zip(offsets, lengths, headers)]
 
     @cached_property
     def uname(self):
         with self.safe_calloc(utsname.sizeof()) as uname:
             assert 0 == self.symbols.uname(uname)
-            return utsname.parse_stream(uname)
+            return utsname.parse(uname.peek(utsname.sizeof()))
 
     @cached_property
     def is_idevice(self):
@@ -167,8 +209,7 @@ class DarwinClient(Client):
         if self.symbols.CFGetTypeID(symbol) == self._CFNullTypeID:
             return None
 
-        with self.safe_malloc(8) as p_error:
-            p_error[0] = 0
+        with self.safe_calloc(8) as p_error:
             objc_data = self._NSPropertyListSerialization.objc_call('dataWithPropertyList:format:options:error:',
                                                                     symbol,
                                                                     CFPropertyListFormat.kCFPropertyListBinaryFormat_v1_0,
@@ -177,28 +218,139 @@ class DarwinClient(Client):
                 raise CfSerializationError()
         if objc_data == 0:
             return None
-        count = self.symbols.CFDataGetLength(objc_data)
-        result = plistlib.loads(self.symbols.CFDataGetBytePtr(objc_data).peek(count))
+        with self.batch() as batch:
+            count = batch.call(self.symbols.CFDataGetLength, objc_data)
+            data = batch.call(self.symbols.CFDataGetBytePtr, objc_data)
+        result = plistlib.loads(data.value.peek(count.value))
         objc_data.objc_call('release')
         return result
 
     def cf(self, o: CfSerializable) -> DarwinSymbol:
-        """ construct a CFObject from a given python object """
+        """
+        Construct a CFObject from a given python object. The caller owns the returned reference.
+        Note that strings are returned as immutable CFStrings, since equal strings share the same cached object.
+        """
         if o is None:
             return self.symbols.kCFNull[0]
 
+        if isinstance(o, str) and '\x00' not in o:
+            return self._cf_str(o)
+
+        if type(o) is bool:
+            return self._cf_bool(o)
+
+        if type(o) is int and o in CF_CACHED_INT_RANGE:
+            return self._cf_int(o)
+
         plist_bytes = plistlib.dumps(o, fmt=plistlib.FMT_BINARY)
-        plist_objc_bytes = self.symbols.CFDataCreate(kCFAllocatorDefault, plist_bytes, len(plist_bytes))
-        with self.safe_malloc(8) as p_error:
-            p_error[0] = 0
-            result = self._NSPropertyListSerialization.objc_call(
-                'propertyListWithData:options:format:error:',
-                plist_objc_bytes,
-                CFPropertyListMutabilityOptions.kCFPropertyListMutableContainersAndLeaves,
-                0, p_error)
-            if p_error[0] != 0:
-                raise CfSerializationError()
-            return result
+
+        # the whole decoding chain is executed remotely using a single round trip
+        with self.batch() as batch:
+            plist_objc_bytes = batch.call(self.symbols.CFDataCreate, kCFAllocatorDefault, plist_bytes,
+                                          len(plist_bytes))
+            result = batch.call(self.symbols.objc_msgSend, self._NSPropertyListSerialization,
+                                self.sel('propertyListWithData:options:format:error:'), plist_objc_bytes,
+                                CFPropertyListMutabilityOptions.kCFPropertyListMutableContainersAndLeaves, 0, 0)
+        if result.value == 0:
+            raise CfSerializationError()
+        return result.value
+
+    def invalidate_cf_cache(self) -> None:
+        """ release all CFObjects cached by `cf()` """
+        with self._cf_cache_lock:
+            while self._cf_cache:
+                _, cached = self._cf_cache.popitem()
+                self.symbols.CFRelease(cached)
+            while self._cf_int_cache:
+                _, cached = self._cf_int_cache.popitem()
+                self.symbols.CFRelease(cached)
+
+    def _cf_str(self, o: str, encoding: CFStringEncoding = CFStringEncoding.kCFStringEncodingUTF8) -> DarwinSymbol:
+        """
+        Get an immutable CFString, reusing the previously created one for recently used strings.
+        The cache keeps a reference of its own, so the returned one is retained and owned by the caller.
+        """
+        key = (str, o, encoding)
+        with self._cf_cache_lock:
+            result = self._cf_cache.get(key)
+            if result is not None:
+                self._cf_cache.move_to_end(key)
+                return self.symbols.CFRetain(result)
+
+            result = self.symbols.CFStringCreateWithCString(kCFAllocatorDefault, o, encoding)
+            if result == 0:
+                raise CfSerializationError(f'failed to create CFString for: {o}')
+            self._cf_cache_insert(key, result)
+            return self.symbols.CFRetain(result)
+
+    def _cf_int(self, o: int) -> DarwinSymbol:
+        """
+        Get an immutable CFNumber, reusing the previously created one for small integers.
+        The cache keeps a reference of its own, so the returned one is retained and owned by the caller.
+        """
+        with self._cf_cache_lock:
+            result = self._cf_int_cache.get(o)
+            if result is not None:
+                return self.symbols.CFRetain(result)
+
+            # the value is passed as an inline buffer, so no remote allocation is required
+            result = self.symbols.CFNumberCreate(kCFAllocatorDefault, kCFNumberSInt64Type, struct.pack('<q', o))
+            if result == 0:
+                raise CfSerializationError(f'failed to create CFNumber for: {o}')
+            self._cf_int_cache[o] = result
+            return self.symbols.CFRetain(result)
+
+    def _cf_bool(self, o: bool) -> DarwinSymbol:
+        """ get the kCFBooleanTrue/kCFBooleanFalse singleton. these are never deallocated, so they are kept for good """
+        result = self._cf_booleans.get(o)
+        if result is None:
+            result = self.symbols.kCFBooleanTrue[0] if o else self.symbols.kCFBooleanFalse[0]
+            self._cf_booleans[o] = result
+        return result
+
+    def _cf_constant(self, o: str) -> DarwinSymbol:
+        """
+        Get a CFString for internal use, resolved once per process like `sel()`. The returned reference is borrowed
+        and stays valid for the lifetime of the remote process, so it must not be released
+        """
+        result = self._cf_constants.get(o)
+        if result is None:
+            result = self.symbols.CFStringCreateWithCString(kCFAllocatorDefault, o,
+                                                            CFStringEncoding.kCFStringEncodingUTF8)
+            if result == 0:
+                raise CfSerializationError(f'failed to create CFString for: {o}')
+            self._cf_constants[o] = result
+        return result
+
+    def _cf_cache_insert(self, key: tuple, cf_object: DarwinSymbol) -> None:
+        """ insert an object into the cache. must be called while holding `_cf_cache_lock` """
+        self._cf_cache[key] = cf_object
+        if len(self._cf_cache) > CF_CACHE_SIZE:
+            _, evicted = self._cf_cache.popitem(last=False)
+            self.symbols.CFRelease(evicted)
+
+    def sel(self, name: str) -> DarwinSymbol:
+        """ get the selector registered for given name. selectors are never freed, so each is resolved only once """
+        sel = self._selectors.get(name)
+        if sel is None:
+            sel = self.symbols.sel_getUid(name)
+            self._selectors[name] = sel
+        return sel
+
+    def objc_class(self, name: str) -> DarwinSymbol:
+        """
+        Get the raw class pointer registered for given name, resolved once per process.
+        Use this in hot paths which only message the class (e.g. `alloc`/`new`), where `symbols.objc_getClass()` would
+        cost a round trip per call. Use `objc_get_class()` instead to get a `Class` wrapper exposing the class's
+        methods, ivars and properties, at the cost of fetching its whole description once.
+        Only found classes are cached, as missing ones may be loaded later on.
+        """
+        objc_class = self._classes.get(name)
+        if objc_class is None:
+            objc_class = self.symbols.objc_getClass(name)
+            if objc_class != 0:
+                self._classes[name] = objc_class
+        return objc_class
 
     def objc_symbol(self, address) -> ObjectiveCSymbol:
         """
@@ -211,7 +363,7 @@ class DarwinClient(Client):
     @lru_cache(maxsize=None)
     def objc_get_class(self, name: str):
         """
-        Get ObjC class object
+        Get ObjC class object, describing its layout. For messaging the class see `objc_class()`
         :param name:
         :return:
         """
@@ -223,10 +375,20 @@ class DarwinClient(Client):
         :param symbol:
         :return:
         """
-        class_info = self.processes.get_self().get_symbol_class_info(symbol)
-        if class_info == 0:
+        if symbol == 0:
             return False
-        return 'ObjC' == class_info.objc_call('typeName').py()
+
+        # messages sent to nil return nil, so the whole chain can be executed remotely using a single round trip
+        with self.batch() as batch:
+            class_info = batch.call(self.symbols.objc_msgSend, self.processes.get_self().vmu_object_identifier,
+                                    self.sel('classInfoForMemory:length:'), symbol, 8)
+            type_name = batch.call(self.symbols.objc_msgSend, class_info, self.sel('typeName'))
+            is_objc = batch.call(self.symbols.objc_msgSend, type_name, self.sel('isEqualToString:'),
+                                 self._cf_constant('ObjC'))
+        return bool(is_objc.value & 0xff)
+
+    def _invalidate_images_cache(self) -> None:
+        self.__dict__.pop('images', None)
 
     def _add_global(self, name: str, value) -> None:
         super()._add_global(name, value)
@@ -269,8 +431,17 @@ class DarwinClient(Client):
                         symbol
                     )
 
+    def dlopen(self, filename: str, mode: int) -> DarwinSymbol:
+        self._invalidate_images_cache()
+        return super().dlopen(filename, mode)
+
+    def dlclose(self, lib: int):
+        self._invalidate_images_cache()
+        return super().dlclose(lib)
+
     def rebind_symbols(self, populate_global_scope=True) -> None:
         logger.debug('rebinding symbols')
+        self._invalidate_images_cache()
         self.loaded_objc_classes.clear()
 
         # enumerate all loaded objc classes
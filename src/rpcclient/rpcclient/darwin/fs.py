@@ -1,16 +1,17 @@
+import contextlib
+import threading
+
 from parameter_decorators import path_to_str
 
 from rpcclient.darwin.structs import stat64, statfs64
 from rpcclient.fs import Fs, RemotePath
 
+XATTR_MAX_VALUE_LEN = 1024
 
-def do_stat(client, stat_name, filename: str):
-    """ stat(filename) at remote. read man for more details. """
-    with client.safe_malloc(stat64.sizeof()) as buf:
-        err = client.symbols[stat_name](filename, buf)
-        if err != 0:
-            client.raise_errno_exception(f'failed to stat(): {filename}')
-        return stat64.parse_stream(buf)
+# stat results are parsed in the hot path of file tree traversals, so avoid construct's reflective parsing
+STAT64_COMPILED = stat64.compile()
+STATFS64_COMPILED = statfs64.compile()
+STAT_SCRATCH_SIZE = max(stat64.sizeof(), statfs64.sizeof())
 
 
 class DarwinRemotePath(RemotePath):
@@ -18,22 +19,45 @@ class DarwinRemotePath(RemotePath):
         super().__init__(path, client)
 
     def stat(self):
-        return do_stat(self._client, 'stat64', self._path)
+        return self._client.fs.stat(self._path)
 
     def lstat(self):
-        return do_stat(self._client, 'lstat64', self._path)
+        return self._client.fs.lstat(self._path)
 
 
 class DarwinFs(Fs):
+    def __init__(self, client):
+        super().__init__(client)
+        self._stat_scratch = None
+        self._stat_scratch_lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _stat_scratch_buffer(self):
+        """
+        Get the buffer stat results are written into. It is allocated once and kept for the lifetime of the remote
+        process, saving a malloc() and free() round trip per stat
+        """
+        with self._stat_scratch_lock:
+            if self._stat_scratch is None:
+                self._stat_scratch = self._client.symbols.malloc(STAT_SCRATCH_SIZE)
+            yield self._stat_scratch
+
+    def _do_stat(self, stat_name: str, filename: str):
+        with self._stat_scratch_buffer() as buf:
+            err = self._client.symbols[stat_name](filename, buf)
+            if err != 0:
+                self._client.raise_errno_exception(f'failed to stat(): {filename}')
+            return STAT64_COMPILED.parse(buf.peek(stat64.sizeof()))
+
     @path_to_str('path')
     def stat(self, path: str):
         """ stat(filename) at remote. read man for more details. """
-        return do_stat(self._client, 'stat64', path)
+        return self._do_stat('stat64', path)
 
     @path_to_str('path')
     def lstat(self, path: str):
         """ lstat(filename) at remote. read man for more details. """
-        return do_stat(self._client, 'lstat64', path)
+        return self._do_stat('lstat64', path)
 
     @path_to_str('path')
     def setxattr(self, path: str, name: str, value: bytes):
@@ -57,14 +81,24 @@ class DarwinFs(Fs):
             count = self._client.symbols.listxattr(path, xattributes_names, max_buf_len, 0).c_int64
             if count == -1:
                 self._client.raise_errno_exception(f'failed to listxattr(): {path}')
-            return [s.decode() for s in xattributes_names.peek(count).split(b'\x00')[:-1]]
+            buf = xattributes_names.peek(count)
+
+        # names are NUL-terminated and packed back to back
+        names = []
+        start = 0
+        while start < count:
+            end = buf.find(b'\x00', start)
+            if end == -1:
+                end = count
+            names.append(buf[start:end].decode())
+            start = end + 1
+        return names
 
     @path_to_str('path')
     def getxattr(self, path: str, name: str) -> bytes:
         """ get an extended attribute value """
-        max_buf_len = 1024
-        with self._client.safe_malloc(max_buf_len) as value:
-            count = self._client.symbols.getxattr(path, name, value, max_buf_len, 0, 0).c_int64
+        with self._client.safe_malloc(XATTR_MAX_VALUE_LEN) as value:
+            count = self._client.symbols.getxattr(path, name, value, XATTR_MAX_VALUE_LEN, 0, 0).c_int64
             if count == -1:
                 self._client.raise_errno_exception(f'failed to getxattr(): {path}')
             return value.peek(count)
@@ -72,17 +106,35 @@ class DarwinFs(Fs):
     @path_to_str('path')
     def dictxattr(self, path: str) -> dict[str, bytes]:
         """ get a dictionary of all extended attributes """
+        names = self.listxattr(path)
+        if not names:
+            return {}
+
+        # read all values using a single round trip, each into its own slot of a shared buffer
+        buf_len = XATTR_MAX_VALUE_LEN * len(names)
+        with self._client.safe_malloc(buf_len) as values:
+            with self._client.batch() as batch:
+                counts = [batch.call(self._client.symbols.getxattr, path, name, values + i * XATTR_MAX_VALUE_LEN,
+                                     XATTR_MAX_VALUE_LEN, 0, 0) for i, name in enumerate(names)]
+            buf = values.peek(buf_len)
+
         result = {}
-        for k in self.listxattr(path):
-            result[k] = self.getxattr(path, k)
+        for i, (name, count) in enumerate(zip(names, counts)):
+            count = count.value.c_int64
+            if count == -1:
+                # errno may have already been overridden by the following calls, so retry on its own to report it
+                result[name] = self.getxattr(path, name)
+                continue
+            offset = i * XATTR_MAX_VALUE_LEN
+            result[name] = buf[offset:offset + count]
         return result
 
     @path_to_str('path')
     def statfs(self, path: str):
-        with self._client.safe_malloc(statfs64.sizeof()) as buf:
+        with self._stat_scratch_buffer() as buf:
             if 0 != self._client.symbols.statfs64(path, buf):
                 self._client.raise_errno_exception(f'statfs failed for: {path}')
-            return statfs64.parse_stream(buf)
+            return STATFS64_COMPILED.parse(buf.peek(statfs64.sizeof()))
 
     @path_to_str('path')
     def chflags(self, path: str, flags: int) -> None:
@@ -13,12 +13,12 @@ class Keychain:
         self._client = client
 
     def add_internet_password(self, account: str, server: str, password: str):
-        attributes = self._client.symbols.objc_getClass('NSMutableDictionary').objc_call('new')
-        attributes.objc_call('setObject:forKey:', self._client.symbols.kSecClassInternetPassword[0],
-                             self._client.symbols.kSecClass[0])
-        attributes.objc_call('setObject:forKey:', self._client.cf(account), self._client.symbols.kSecAttrAccount[0])
-        attributes.objc_call('setObject:forKey:', self._client.cf(server), self._client.symbols.kSecAttrServer[0])
-        attributes.objc_call('setObject:forKey:', self._client.cf(password), self._client.symbols.kSecValueData[0])
+        attributes = self._create_dict([
+            (self._client.symbols.kSecClass[0], self._client.symbols.kSecClassInternetPassword[0]),
+            (self._client.symbols.kSecAttrAccount[0], self._client.cf(account)),
+            (self._client.symbols.kSecAttrServer[0], self._client.cf(server)),
+            (self._client.symbols.kSecValueData[0], self._client.cf(password)),
+        ])
         err = self._client.symbols.SecItemAdd(attributes, 0).c_int32
         if err != 0:
             raise BadReturnValueError(f'SecItemAdd() returned: {err}')
@@ -45,17 +45,13 @@ class Keychain:
         with self._client.safe_malloc(8) as p_result:
             p_result[0] = 0
 
-            query = self._client.symbols.objc_getClass('NSMutableDictionary').objc_call('new')
-            query.objc_call('setObject:forKey:', class_type[0],
-                            self._client.symbols.kSecClass[0])
-            query.objc_call('setObject:forKey:', self._client.symbols.kSecMatchLimitAll[0],
-                            self._client.symbols.kSecMatchLimit[0])
-            query.objc_call('setObject:forKey:', self._client.symbols.kCFBooleanTrue[0],
-                            self._client.symbols.kSecReturnAttributes[0])
-            query.objc_call('setObject:forKey:', self._client.symbols.kCFBooleanTrue[0],
-                            self._client.symbols.kSecReturnRef[0])
-            query.objc_call('setObject:forKey:', self._client.symbols.kCFBooleanTrue[0],
-                            self._client.symbols.kSecReturnData[0])
+            query = self._create_dict([
+                (self._client.symbols.kSecClass[0], class_type[0]),
+                (self._client.symbols.kSecMatchLimit[0], self._client.symbols.kSecMatchLimitAll[0]),
+                (self._client.symbols.kSecReturnAttributes[0], self._client.symbols.kCFBooleanTrue[0]),
+                (self._client.symbols.kSecReturnRef[0], self._client.symbols.kCFBooleanTrue[0]),
+                (self._client.symbols.kSecReturnData[0], self._client.symbols.kCFBooleanTrue[0]),
+            ])
 
             err = self._client.symbols.SecItemCopyMatching(query, p_result).c_int32
             if err != 0:
@@ -68,7 +64,20 @@ class Keychain:
 
             # results contain a reference which isn't plist-serializable
             keys_to_remove = [self._client.cf('v_Ref'), self._client.cf('accc')]
-            for i in range(result.objc_call('count')):
-                for removal_key in keys_to_remove:
-                    result.objc_call('objectAtIndex:', i).objc_call('removeObjectForKey:', removal_key)
+            objc_msgSend = self._client.symbols.objc_msgSend
+            with self._client.batch() as batch:
+                for i in range(result.objc_call('count')):
+                    item = batch.call(objc_msgSend, result, self._client.sel('objectAtIndex:'), i)
+                    for removal_key in keys_to_remove:
+                        batch.call(objc_msgSend, item, self._client.sel('removeObjectForKey:'), removal_key)
             return result.py()
+
+    def _create_dict(self, items: list[tuple[Symbol, Symbol]]) -> Symbol:
+        """ create an NSMutableDictionary from given (key, value) pairs using a single round trip """
+        objc_msgSend = self._client.symbols.objc_msgSend
+        with self._client.batch() as batch:
+            dictionary = batch.call(objc_msgSend, self._client.objc_class('NSMutableDictionary'),
+                                    self._client.sel('new'))
+            for key, value in items:
+                batch.call(objc_msgSend, dictionary, self._client.sel('setObject:forKey:'), value, key)
+        return dictionary.value
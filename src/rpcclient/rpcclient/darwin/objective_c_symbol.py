@@ -16,6 +16,10 @@ from rpcclient.exceptions import RpcClientException
 from rpcclient.symbol import Symbol
 from rpcclient.symbols_jar import SymbolsJar
 
+# leading characters of type encodings which can never describe an objc object (scalars, C strings, selectors,
+# bitfields and aggregates), so ivars of these types don't have to be classified remotely
+NON_OBJECT_TYPE_ENCODINGS = tuple('cislqCISLQfdB*:b{([')
+
 
 class SettingIvarError(RpcClientException):
     """ Raise when trying to set an Ivar too early or when the Ivar doesn't exist. """
@@ -203,7 +207,7 @@ class ObjectiveCSymbol(DarwinSymbol):
         # Ivars
         for ivar in self.ivars:
             if ivar.name == item:
-                if self._client.is_objc_type(ivar.value):
+                if not ivar.type_.startswith(NON_OBJECT_TYPE_ENCODINGS) and self._client.is_objc_type(ivar.value):
                     return ivar.value.objc_symbol
                 return ivar.value
 
@@ -161,7 +161,7 @@ class IntelThread64(Thread):
                 if self._client.symbols.thread_get_state(self._thread_id, x86_THREAD_STATE64,
                                                          p_state, p_thread_state_count):
                     raise BadReturnValueError('thread_get_state() failed')
-                return x86_thread_state64_t.parse_stream(p_state)
+                return x86_thread_state64_t.parse(p_state.peek(x86_thread_state64_t.sizeof()))
 
     def set_state(self, state: dict) -> None:
         if self._client.symbols.thread_set_state(self._thread_id, x86_THREAD_STATE64,
@@ -178,7 +178,7 @@ class ArmThread64(Thread):
                 if self._client.symbols.thread_get_state(self._thread_id, ARMThreadFlavors.ARM_THREAD_STATE64,
                                                          p_state, p_thread_state_count):
                     raise BadReturnValueError('thread_get_state() failed')
-                return arm_thread_state64_t.parse_stream(p_state)
+                return arm_thread_state64_t.parse(p_state.peek(arm_thread_state64_t.sizeof()))
 
     def set_state(self, state: dict) -> None:
         if self._client.symbols.thread_set_state(self._thread_id, ARMThreadFlavors.ARM_THREAD_STATE64,
@@ -442,7 +442,7 @@ class Process:
                 count[0] = TASK_DYLD_INFO_COUNT
                 if self._client.symbols.task_info(self.task, TASK_DYLD_INFO, dyld_info, count):
                     raise BadReturnValueError('task_info(TASK_DYLD_INFO) failed')
-                dyld_info_data = task_dyld_info_data_t.parse_stream(dyld_info)
+                dyld_info_data = task_dyld_info_data_t.parse(dyld_info.peek(task_dyld_info_data_t.sizeof()))
         all_image_infos = all_image_infos_t.parse(
             self.peek(dyld_info_data.all_image_info_addr, dyld_info_data.all_image_info_size))
 
@@ -580,7 +580,7 @@ class Process:
         with self._client.safe_malloc(proc_taskallinfo.sizeof()) as pti:
             if not self._client.symbols.proc_pidinfo(self.pid, PROC_PIDTASKALLINFO, 0, pti, proc_taskallinfo.sizeof()):
                 raise BadReturnValueError('proc_pidinfo(PROC_PIDTASKALLINFO) failed')
-            return proc_taskallinfo.parse_stream(pti)
+            return proc_taskallinfo.parse(pti.peek(proc_taskallinfo.sizeof()))
 
     @property
     def backtraces(self) -> list[Backtrace]:
@@ -957,17 +957,18 @@ class DarwinProcesses(Processes):
 
     def list(self) -> list[Process]:
         """ list all currently running processes """
-        n = self._client.symbols.proc_listallpids(0, 0)
+        n = self._client.symbols.proc_listallpids(0, 0).c_int32
+        if n < 0:
+            raise BadReturnValueError('proc_listallpids() failed')
         pid_buf_size = pid_t.sizeof() * n
         with self._client.safe_malloc(pid_buf_size) as pid_buf:
-            pid_buf.item_size = pid_t.sizeof()
-            n = self._client.symbols.proc_listallpids(pid_buf, pid_buf_size)
+            n = self._client.symbols.proc_listallpids(pid_buf, pid_buf_size).c_int32
+            if n < 0:
+                raise BadReturnValueError('proc_listallpids() failed')
 
-            result = []
-            for i in range(n):
-                pid = int(pid_buf[i])
-                result.append(Process(self._client, pid))
-            return result
+            # read the whole buffer at once rather than peeking each pid separately
+            pids = struct.unpack(f'<{n}I', pid_buf.peek(n * pid_t.sizeof()))
+            return [Process(self._client, pid) for pid in pids]
 
     def disable_watchdog(self) -> None:
         while True:
@@ -9,8 +9,8 @@ from rpcclient.symbol import Symbol
 class DarwinSymbol(Symbol):
     def objc_call(self, selector, *params, **kwargs):
         """ call an objc method on a given object """
-        sel = self._client.symbols.sel_getUid(selector)
-        if not self._client.symbols.objc_msgSend(self, self._client.symbols.sel_getUid("respondsToSelector:"), sel):
+        sel = self._client.sel(selector)
+        if not self._client.symbols.objc_msgSend(self, self._client.sel('respondsToSelector:'), sel):
             raise UnrecognizedSelectorError(f"unrecognized selector '{selector}' sent to class")
 
         return self._client.symbols.objc_msgSend(self, sel, *params, **kwargs)
@@ -71,7 +71,7 @@ class OsLogPreferencesBase:
 
 class OsLogPreferencesCategory(OsLogPreferencesBase):
     def __init__(self, client, category: str, subsystem: DarwinSymbol):
-        obj = client.symbols.objc_getClass('OSLogPreferencesCategory').objc_call('alloc').objc_call(
+        obj = client.objc_class('OSLogPreferencesCategory').objc_call('alloc').objc_call(
             'initWithName:subsystem:', client.cf(category), subsystem)
         super().__init__(client, obj)
 
@@ -85,7 +85,7 @@ class OsLogPreferencesCategory(OsLogPreferencesBase):
 
 class OsLogPreferencesSubsystem(OsLogPreferencesBase):
     def __init__(self, client, subsystem: str):
-        obj = client.symbols.objc_getClass('OSLogPreferencesSubsystem').objc_call('alloc').objc_call(
+        obj = client.objc_class('OSLogPreferencesSubsystem').objc_call('alloc').objc_call(
             'initWithName:', client.cf(subsystem))
         super().__init__(client, obj)
 
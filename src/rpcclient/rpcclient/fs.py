@@ -563,10 +563,9 @@ class Fs:
     @path_to_str('path')
     def scandir(self, path: str = '.') -> list[DirEntry]:
         """ get directory listing for a given dirname """
-        result = []
-        for entry in self._client.listdir(path)[2:]:
-            result.append(DirEntry(path, entry, self._client))
-        return result
+        # the server opens, reads and stats the whole directory within a single round trip
+        return [DirEntry(path, entry, self._client) for entry in self._client.listdir(path)
+                if entry.d_name not in ('.', '..')]
 
     @path_to_str('path')
     def stat(self, path: str):
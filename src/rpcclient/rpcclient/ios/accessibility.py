@@ -273,7 +273,7 @@ class AXElement(DarwinSymbol):
         element = element._element_for_attribute(95225, self._client.cf([
             direction,
             0,
-            self._client.symbols.objc_getClass('NSValue').objc_call('valueWithRange:', 0x7fffffff, 0),
+            self._client.objc_class('NSValue').objc_call('valueWithRange:', 0x7fffffff, 0),
             'AXAudit'
         ]))
 
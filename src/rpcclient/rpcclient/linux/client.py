@@ -14,4 +14,4 @@ class LinuxClient(Client):
     def uname(self):
         with self.safe_calloc(utsname.sizeof()) as uname:
             assert 0 == self.symbols.uname(uname)
-            return utsname.parse_stream(uname)
+            return utsname.parse(uname.peek(utsname.sizeof()))
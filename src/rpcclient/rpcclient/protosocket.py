@@ -7,7 +7,7 @@ from rpcclient.protobuf_bridge import CmdClose, Command, Handshake, Response
 
 # field[0] is MAGIC - skip
 COMMAND_MAPPING = {field.message_type.name: field.name for field in Command.DESCRIPTOR.fields[1:]}
-SERVER_MAGIC_VERSION = 0x88888809
+SERVER_MAGIC_VERSION = 0x8888880a
 MAGIC = 0x12345679
 MAX_PATH_LEN = 1024
 
@@ -42,29 +42,31 @@ class ProtoSocket:
             return getattr(response, command_type.lower())
 
     def _receive(self) -> tuple[int, bytes]:
-        try:
-            size = struct.unpack('<Q', self.raw_socket.recv(8))[0]
-            buff = self._recvall(size)
-            return size, buff
-        except struct.error:
-            raise ConnectionError()
+        size = struct.unpack('<Q', self._recvall(8))[0]
+        buff = self._recvall(size)
+        return size, buff
 
     def _send(self, message: bytes) -> None:
         buff = struct.pack('<Q', len(message)) + message
         self.raw_socket.sendall(buff)
 
     def _recvall(self, size: int) -> bytes:
-        buf = b''
-        while size:
+        # receive directly into a preallocated buffer, so large responses aren't copied over and over while the
+        # protocol lock is held
+        buf = bytearray(size)
+        view = memoryview(buf)
+        offset = 0
+        while offset < size:
             try:
-                chunk = self.raw_socket.recv(size)
+                count = self.raw_socket.recv_into(view[offset:], size - offset)
             except BlockingIOError:
                 continue
-            if not self.raw_socket.getblocking() and not chunk:
-                raise ServerDiedError()
-            size -= len(chunk)
-            buf += chunk
-        return buf
+            if not count:
+                if not self.raw_socket.getblocking():
+                    raise ServerDiedError()
+                raise ConnectionError()
+            offset += count
+        return bytes(buf)
 
     def close(self) -> None:
         command = Command(magic=MAGIC, close=CmdClose())
@@ -104,35 +104,19 @@ class Sysctl:
 
     def get(self, ctl: CTL, kern: KERN, arg: int = None, size=MAX_SIZE) -> bytes:
         """ call sysctl(int *name, u_int namelen, void *oldp, size_t *oldlenp, void *newp, size_t newlen) on remote """
-        namelen = 2
-
-        with self._client.safe_malloc(4 * 3) as mib:
-            mib.item_size = 4
-            mib[0] = ctl
-            mib[1] = kern
-            if arg is not None:
-                mib[2] = int(arg)
-                namelen += 1
-            with self._client.safe_malloc(8) as oldenp:
-                oldenp[0] = size
-                with self._client.safe_malloc(size) as oldp:
-                    if self._client.symbols.sysctl(mib, namelen, oldp, oldenp, 0, 0):
-                        self._client.raise_errno_exception('sysctl() failed')
-                    return oldp.peek(oldenp[0])
+        mib = self._build_mib(ctl, kern, arg)
+        with self._client.safe_malloc(8) as oldenp:
+            oldenp[0] = size
+            with self._client.safe_malloc(size) as oldp:
+                if self._client.symbols.sysctl(mib, len(mib) // 4, oldp, oldenp, 0, 0):
+                    self._client.raise_errno_exception('sysctl() failed')
+                return oldp.peek(oldenp[0])
 
     def set(self, ctl: CTL, kern: KERN, oldp: DarwinSymbol, oldenp: DarwinSymbol, arg: int = None):
         """ call sysctl(int *name, u_int namelen, void *oldp, size_t *oldlenp, void *newp, size_t newlen) on remote """
-        namelen = 2
-
-        with self._client.safe_malloc(4 * 3) as mib:
-            mib.item_size = 4
-            mib[0] = ctl
-            mib[1] = kern
-            if arg is not None:
-                mib[2] = int(arg)
-                namelen += 1
-            if self._client.symbols.sysctl(mib, namelen, oldp, oldenp, 0, 0):
-                self._client.raise_errno_exception('sysctl() failed')
+        mib = self._build_mib(ctl, kern, arg)
+        if self._client.symbols.sysctl(mib, len(mib) // 4, oldp, oldenp, 0, 0):
+            self._client.raise_errno_exception('sysctl() failed')
 
     def get_str_by_name(self, name: str) -> str:
         """ equivalent of: sysctl <name> """
@@ -164,3 +148,14 @@ class Sysctl:
                 if self._client.symbols.sysctlbyname(name, oldval, p_oldval_len, 0, 0):
                     self._client.raise_errno_exception('sysctlbyname() failed')
                 return oldval.peek(p_oldval_len[0])
+
+    @staticmethod
+    def _build_mib(ctl: CTL, kern: KERN, arg: int = None) -> bytes:
+        """
+        build the MIB name as a packed int array. sysctl() only reads it, so it is passed inline with the call instead
+        of being allocated and poked element by element at remote
+        """
+        mib = [ctl, kern]
+        if arg is not None:
+            mib.append(int(arg))
+        return struct.pack(f'<{len(mib)}i', *mib)
@@ -125,3 +125,44 @@ def test_reconnect(client):
     test_listdir(client)
     client.reconnect()
     test_listdir(client)
+
+
+def test_batch(client):
+    """
+    :param rpcclient.client.Client client:
+    """
+    with client.batch() as batch:
+        buf = batch.call(client.symbols.malloc, 0x10)
+        batch.call(client.symbols.strcpy, buf, 'hello')
+        length = batch.call(client.symbols.strlen, buf)
+        batch.call(client.symbols.free, buf)
+    assert length.value == 5
+
+
+def test_batch_result_of_dispatched_batch(client):
+    """
+    :param rpcclient.client.Client client:
+    """
+    with client.batch() as batch:
+        buf = batch.call(client.symbols.malloc, 0x10)
+    with client.batch() as batch:
+        batch.call(client.symbols.strcpy, buf, 'hello')
+        length = batch.call(client.symbols.strlen, buf)
+        batch.call(client.symbols.free, buf)
+    assert length.value == 5
+
+
+def test_batch_result_of_pending_batch(client):
+    """
+    :param rpcclient.client.Client client:
+    """
+    with pytest.raises(ArgumentError):
+        with client.batch() as first:
+            pid = first.call(client.symbols.getpid)
+            with client.batch() as second:
+                second.call(client.symbols.getpgid, pid)
+
+    with client.batch() as batch:
+        pid = batch.call(client.symbols.getpid)
+        with pytest.raises(ArgumentError):
+            client.symbols.getpgid(pid)
@@ -2,6 +2,9 @@ import datetime
 
 import pytest
 
+from rpcclient.darwin.client import CF_CACHE_SIZE, CF_CACHED_INT_RANGE
+from rpcclient.darwin.consts import CFStringEncoding
+
 pytestmark = pytest.mark.darwin
 
 
@@ -19,3 +22,43 @@ pytestmark = pytest.mark.darwin
     [{'key': 'value'}, [1, 2]]])
 def test_serialization(client, data):
     assert client.cf(data).py() == data
+
+
+def test_str_reuse(client):
+    # short strings are tagged pointers, which compare equal even when created separately
+    string = 'a string too long to be stored as a tagged pointer'
+    key = (str, string, CFStringEncoding.kCFStringEncodingUTF8)
+    first = client.cf(string)
+    assert client.cf(string) == first
+    assert client._cf_cache[key] == first
+
+    client.invalidate_cf_cache()
+    assert len(client._cf_cache) == 0
+    # the caller's reference outlives the cache's one
+    assert first.py() == string
+    assert client.cf(string).py() == string
+    assert key in client._cf_cache
+
+
+def test_str_cache_eviction(client):
+    client.invalidate_cf_cache()
+    string = 'the first string, which gets evicted from the cache'
+    first = client.cf(string)
+    for i in range(CF_CACHE_SIZE):
+        client.cf(f'a string too long to be stored as a tagged pointer #{i}')
+    assert len(client._cf_cache) == CF_CACHE_SIZE
+    assert (str, string, CFStringEncoding.kCFStringEncodingUTF8) not in client._cf_cache
+    assert first.py() == string
+
+
+def test_small_int_reuse(client):
+    # small CFNumbers are tagged pointers, so the cache itself must be inspected
+    value = client.cf(7)
+    assert client._cf_int_cache[7] == value
+    assert value.py() == 7
+    assert client.cf(-128).py() == -128
+    assert -128 in client._cf_int_cache
+
+    uncached = CF_CACHED_INT_RANGE.stop
+    assert client.cf(uncached).py() == uncached
+    assert uncached not in client._cf_int_cache
@@ -10,6 +10,16 @@ def test_modules(client):
     assert '/usr/lib/libSystem.B.dylib' in [module.name for module in client.images]
 
 
+def test_modules_cache(client):
+    """
+    :param rpcclient.darwin.client.DarwinClient client:
+    """
+    images = client.images
+    assert client.images is images
+    client.load_framework('Foundation')
+    assert client.images is not images
+
+
 def test_uname(client):
     """
     :param rpcclient.client.Client client:
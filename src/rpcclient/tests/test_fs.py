@@ -204,6 +204,14 @@ def test_xattr(client, tmp_path):
     assert client.fs.listxattr(tmp_path) == []
 
 
+@pytest.mark.darwin
+def test_dictxattr_multiple(client, tmp_path):
+    client.fs.setxattr(tmp_path, 'KEY1', b'VALUE1')
+    client.fs.setxattr(tmp_path, 'KEY2', b'')
+    client.fs.setxattr(tmp_path, 'KEY3', b'VALUE3' * 100)
+    assert client.fs.dictxattr(tmp_path) == {'KEY1': b'VALUE1', 'KEY2': b'', 'KEY3': b'VALUE3' * 100}
+
+
 @pytest.mark.darwin
 def test_chflags(client, tmp_path):
     # create temporary file
@@ -194,6 +194,9 @@ bool send_response(int sockfd, ProtobufCMessage *resp) {
     } else if (strcmp("Rpc__ResponseCall", c_name) == 0) {
         response.type_case = RPC__RESPONSE__TYPE_CALL;
         response.call = (Rpc__ResponseCall *) resp;
+    } else if (strcmp("Rpc__ResponseBatchCall", c_name) == 0) {
+        response.type_case = RPC__RESPONSE__TYPE_BATCH_CALL;
+        response.batch_call = (Rpc__ResponseBatchCall *) resp;
     } else if (strcmp("Rpc__ResponseError", c_name) == 0) {
         response.type_case = RPC__RESPONSE__TYPE_ERROR;
         response.error = (Rpc__ResponseError *) resp;
@@ -60,13 +60,14 @@ Example usage: \n\
 
 #define MAX_OPTION_LEN (256)
 #define BUFFERSIZE (64 * 1024)
+#define LISTDIR_INITIAL_ENTRIES (64)
 #define INVALID_PID (0xffffffff)
 #define WORKER_CLIENT_SOCKET_FD (3)
 #define CLOBBERD_LIST                                                          \
     "x0", "x1", "x2", "x3", "x4", "x5", "x6", "x7", "x8", "x19", "x20", "x21", \
         "x22", "x23", "x24", "x25", "x26"
 
-#define SERVER_MAGIC_VERSION (0x88888809)
+#define SERVER_MAGIC_VERSION (0x8888880a)
 extern char **environ;
 
 typedef struct {
@@ -303,7 +304,7 @@ bool handle_dlsym(int sockfd, Rpc__CmdDlsym *cmd) {
 
 #ifdef __ARM_ARCH_ISA_A64
 
-void call_function(intptr_t address, size_t va_list_index, size_t argc,
+bool call_function(intptr_t address, size_t va_list_index, size_t argc,
                    Rpc__Argument **p_argv, Rpc__ResponseCall *resp) {
 
     arm_args_t args = {0};
@@ -325,7 +326,8 @@ void call_function(intptr_t address, size_t va_list_index, size_t argc,
                 (idx_fp < MAX_REGS_ARGS) ? (intptr_t *) &args.d[idx_fp++] : NULL;
             break;
         default:
-            break;
+            TRACE("unsupported argument type: %d", p_argv[idx_argv]->type_case);
+            return false;
         }
         // Use the stack if `va_list_index` or if the target register is not
         // available
@@ -414,6 +416,7 @@ void call_function(intptr_t address, size_t va_list_index, size_t argc,
           [args_stack] "r"(&args.stack), [max_args] "r"((uint64_t) MAX_STACK_ARGS),
           [address] "r"(address), [result_registers] "r"(&resp->arm_registers->x0)
         : CLOBBERD_LIST);
+    return true;
 }
 
 #else
@@ -421,7 +424,7 @@ void call_function(intptr_t address, size_t va_list_index, size_t argc,
 typedef u64 (*call_argc_t)(u64, u64, u64, u64, u64, u64, u64, u64, u64, u64,
                            u64, u64, u64, u64, u64, u64, u64);
 
-void call_function(intptr_t address, size_t va_list_index, size_t argc,
+bool call_function(intptr_t address, size_t va_list_index, size_t argc,
                    Rpc__Argument **p_argv,
                    Rpc__ResponseCall *response) {
     s64 return_val;
@@ -443,13 +446,15 @@ void call_function(intptr_t address, size_t va_list_index, size_t argc,
             args[i] = (uint64_t) p_argv[i]->v_bytes.data;
             break;
         default:
-            break;
+            TRACE("unsupported argument type: %d", p_argv[i]->type_case);
+            return false;
         }
     }
     return_val = call(args[0], args[1], args[2], args[3], args[4], args[5],
                       args[6], args[7], args[8], args[9], args[10], args[11], args[12], args[13], args[14], args[15], args[16]);
     response->return_values_case = RPC__RESPONSE_CALL__RETURN_VALUES_RETURN_VALUE;
     response->return_value = return_val;
+    return true;
 }
 
 #endif// __ARM_ARCH_ISA_A64
@@ -465,11 +470,104 @@ bool handle_call(int sockfd, Rpc__CmdCall *cmd) {
     resp_call.return_values_case = RPC__RESPONSE_CALL__RETURN_VALUES_RETURN_VALUE;
 #endif
     TRACE("address: %p", cmd->address);
-    call_function(cmd->address, cmd->va_list_index, cmd->n_argv, cmd->argv,
-                  &resp_call);
+    if (!call_function(cmd->address, cmd->va_list_index, cmd->n_argv, cmd->argv,
+                       &resp_call)) {
+        Rpc__ResponseError error = RPC__RESPONSE_ERROR__INIT;
+        return send_response(sockfd, (ProtobufCMessage *) &error);
+    }
     return send_response(sockfd, (ProtobufCMessage *) &resp_call);
 }
 
+u64 get_call_result(Rpc__ResponseCall *response) {
+#ifdef __ARM_ARCH_ISA_A64
+    return response->arm_registers->x0;
+#else
+    return response->return_value;
+#endif
+}
+
+bool handle_batch_call(int sockfd, Rpc__CmdBatchCall *cmd) {
+    TRACE("enter");
+    bool ret = false;
+    Rpc__ResponseBatchCall resp_batch_call = RPC__RESPONSE_BATCH_CALL__INIT;
+    Rpc__ResponseCall *results = NULL;
+#ifdef __ARM_ARCH_ISA_A64
+    Rpc__ReturnRegistersArm *regs = NULL;
+#endif
+    Rpc__ResponseError error = RPC__RESPONSE_ERROR__INIT;
+
+    // verify every argument is supported and only refers to calls preceding it before executing anything
+    for (size_t i = 0; i < cmd->n_calls; i++) {
+        for (size_t j = 0; j < cmd->calls[i]->n_argv; j++) {
+            Rpc__Argument *arg = cmd->calls[i]->argv[j];
+            switch (arg->type_case) {
+            case RPC__ARGUMENT__TYPE_V_STR:
+            case RPC__ARGUMENT__TYPE_V_BYTES:
+            case RPC__ARGUMENT__TYPE_V_INT:
+            case RPC__ARGUMENT__TYPE_V_DOUBLE:
+                break;
+            case RPC__ARGUMENT__TYPE_V_INPUT_FROM:
+                if (arg->v_input_from < i) {
+                    break;
+                }
+                TRACE("call %zu refers to a non-preceding call", i);
+                CHECK(send_response(sockfd, (ProtobufCMessage *) &error));
+                return true;
+            default:
+                TRACE("call %zu has an unsupported argument type: %d", i, arg->type_case);
+                CHECK(send_response(sockfd, (ProtobufCMessage *) &error));
+                return true;
+            }
+        }
+    }
+
+    results = (Rpc__ResponseCall *) calloc(cmd->n_calls, sizeof(Rpc__ResponseCall));
+    resp_batch_call.results = (Rpc__ResponseCall **) calloc(cmd->n_calls, sizeof(Rpc__ResponseCall *));
+    CHECK(results != NULL && resp_batch_call.results != NULL);
+#ifdef __ARM_ARCH_ISA_A64
+    regs = (Rpc__ReturnRegistersArm *) calloc(cmd->n_calls, sizeof(Rpc__ReturnRegistersArm));
+    CHECK(regs != NULL);
+#endif
+
+    for (size_t i = 0; i < cmd->n_calls; i++) {
+        Rpc__CmdCall *call = cmd->calls[i];
+
+        rpc__response_call__init(&results[i]);
+#ifdef __ARM_ARCH_ISA_A64
+        rpc__return_registers_arm__init(&regs[i]);
+        results[i].arm_registers = &regs[i];
+        results[i].return_values_case = RPC__RESPONSE_CALL__RETURN_VALUES_ARM_REGISTERS;
+#else
+        results[i].return_values_case = RPC__RESPONSE_CALL__RETURN_VALUES_RETURN_VALUE;
+#endif
+
+        // substitute references to previous calls with their actual return values
+        for (size_t j = 0; j < call->n_argv; j++) {
+            Rpc__Argument *arg = call->argv[j];
+            if (arg->type_case == RPC__ARGUMENT__TYPE_V_INPUT_FROM) {
+                arg->type_case = RPC__ARGUMENT__TYPE_V_INT;
+                arg->v_int = get_call_result(&results[arg->v_input_from]);
+            }
+        }
+
+        TRACE("address: %p", call->address);
+        // arguments were all validated above, so this can't fail
+        CHECK(call_function(call->address, call->va_list_index, call->n_argv, call->argv, &results[i]));
+        resp_batch_call.results[i] = &results[i];
+    }
+    resp_batch_call.n_results = cmd->n_calls;
+    CHECK(send_response(sockfd, (ProtobufCMessage *) &resp_batch_call));
+    ret = true;
+
+error:
+    safe_free((void **) &resp_batch_call.results);
+    safe_free((void **) &results);
+#ifdef __ARM_ARCH_ISA_A64
+    safe_free((void **) &regs);
+#endif
+    return ret;
+}
+
 bool handle_peek(int sockfd, Rpc__CmdPeek *cmd) {
     TRACE("enter");
     uint8_t *buffer = NULL;
@@ -596,22 +694,21 @@ bool handle_listdir(int sockfd, Rpc__CmdListDir *cmd) {
         CHECK(send_response(sockfd, (ProtobufCMessage *) &error));
         return true;
     }
-    for (entry = readdir(dirp); entry != NULL; entry = readdir(dirp)) {
-        entry_count++;
-    }
-    CHECK(0 == closedir(dirp));
-
-    dirp = opendir(cmd->path);
-    CHECK(dirp != NULL);
 
     resp_list_dir.magic = MAGIC;
     resp_list_dir.dirp = (uint64_t) dirp;
-    resp_list_dir.n_dir_entries = entry_count;
-    resp_list_dir.dir_entries =
-        (Rpc__DirEntry **) malloc(sizeof(Rpc__DirEntry *) * entry_count);
-    CHECK(resp_list_dir.dir_entries != NULL);
 
-    while ((entry = readdir(dirp)) != NULL && entry_count > idx) {
+    // collect all entries in a single pass, growing the entries array as needed
+    while ((entry = readdir(dirp)) != NULL) {
+        if (idx == entry_count) {
+            Rpc__DirEntry **dir_entries = NULL;
+            entry_count = entry_count ? entry_count * 2 : LISTDIR_INITIAL_ENTRIES;
+            dir_entries = (Rpc__DirEntry **) realloc(resp_list_dir.dir_entries,
+                                                     sizeof(Rpc__DirEntry *) * entry_count);
+            CHECK(dir_entries != NULL);
+            resp_list_dir.dir_entries = dir_entries;
+        }
+
         struct stat system_lstat = {0};
         struct stat system_stat = {0};
         char fullpath[FILENAME_MAX] = {0};
@@ -674,8 +771,12 @@ bool handle_listdir(int sockfd, Rpc__CmdListDir *cmd) {
         d_entry->lstat = l_stat;
 
         resp_list_dir.dir_entries[idx] = d_entry;
+        d_entry = NULL;
+        d_stat = NULL;
+        l_stat = NULL;
         idx++;
     }
+    resp_list_dir.n_dir_entries = idx;
     CHECK(send_response(sockfd, (ProtobufCMessage *) &resp_list_dir));
     ret = true;
 
@@ -684,7 +785,10 @@ error:
         closedir(dirp);
     }
 
-    for (uint64_t i = 0; i < entry_count; i++) {
+    safe_free((void **) &d_entry);
+    safe_free((void **) &d_stat);
+    safe_free((void **) &l_stat);
+    for (uint64_t i = 0; i < idx; i++) {
         safe_free((void **) &resp_list_dir.dir_entries[i]->d_name);
         safe_free((void **) &resp_list_dir.dir_entries[i]->stat);
         safe_free((void **) &resp_list_dir.dir_entries[i]->lstat);
@@ -751,6 +855,10 @@ void handle_client(int sockfd) {
             CHECK(handle_call(sockfd, cmd->call));
             break;
         }
+        case RPC__COMMAND__TYPE_BATCH_CALL: {
+            CHECK(handle_batch_call(sockfd, cmd->batch_call));
+            break;
+        }
         case RPC__COMMAND__TYPE_PEEK: {
             CHECK(handle_peek(sockfd, cmd->peek));
             break;